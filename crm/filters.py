@@ -1,9 +1,34 @@
 import django_filters
-from django_filters import FilterSet, CharFilter, DateFilter, DecimalFilter, NumberFilter, ModelMultipleChoiceFilter, MethodFilter
+from django_filters import FilterSet, BooleanFilter, CharFilter, DateFilter, NumberFilter, ModelMultipleChoiceFilter
+from django.conf import settings
 from django.db.models import Q
+from django.utils import timezone
+from datetime import datetime, time, timedelta
 
 from .models import Customer, Product, Order
 
+
+def start_of_day(value):
+    """
+    Converts a date into the (timezone-aware) datetime at which that day starts.
+    Filtering a DateTimeField against this boundary keeps the column bare, so the
+    index on it can be range-scanned instead of casting every row to a date.
+    """
+    boundary = datetime.combine(value, time.min)
+    if settings.USE_TZ:
+        boundary = timezone.make_aware(boundary)
+    return boundary
+
+
+def filter_on_or_after(queryset, field_name, value):
+    """Keeps rows whose datetime falls on or after the given date."""
+    return queryset.filter(**{f'{field_name}__gte': start_of_day(value)})
+
+
+def filter_on_or_before(queryset, field_name, value):
+    """Keeps rows whose datetime falls on or before the given date (the whole day included)."""
+    return queryset.filter(**{f'{field_name}__lt': start_of_day(value + timedelta(days=1))})
+
 class CustomerFilter(FilterSet):
     """
     Filter set for the Customer model, enabling searches by name, email, and creation date range.
@@ -13,12 +38,12 @@ class CustomerFilter(FilterSet):
     email = CharFilter(field_name='email', lookup_expr='icontains')
 
     # Date range filters (e.g., createdAtGte, createdAtLte)
-    created_at__gte = DateFilter(field_name='created_at', lookup_expr='date__gte')
-    created_at__lte = DateFilter(field_name='created_at', lookup_expr='date__lte')
+    created_at__gte = DateFilter(field_name='created_at', method=filter_on_or_after)
+    created_at__lte = DateFilter(field_name='created_at', method=filter_on_or_before)
 
     # Challenge: Custom filter to match phone number patterns (starts with +1)
     # The filter name in GraphQL will be 'phonePattern' based on the method name
-    phone_pattern = MethodFilter(method='filter_by_phone_pattern')
+    phone_pattern = CharFilter(method='filter_by_phone_pattern')
 
     class Meta:
         model = Customer
@@ -40,15 +65,15 @@ class ProductFilter(FilterSet):
     name = CharFilter(field_name='name', lookup_expr='icontains')
 
     # Price range filters (e.g., priceGte, priceLte)
-    price__gte = DecimalFilter(field_name='price', lookup_expr='gte')
-    price__lte = DecimalFilter(field_name='price', lookup_expr='lte')
+    price__gte = NumberFilter(field_name='price', lookup_expr='gte')
+    price__lte = NumberFilter(field_name='price', lookup_expr='lte')
 
     # Stock range filters (e.g., stockGte, stockLte)
     stock__gte = NumberFilter(field_name='stock', lookup_expr='gte')
     stock__lte = NumberFilter(field_name='stock', lookup_expr='lte')
 
     # Challenge: Filter products with low stock (e.g., stock < 10)
-    low_stock = MethodFilter(method='filter_low_stock')
+    low_stock = BooleanFilter(method='filter_low_stock')
 
     class Meta:
         model = Product
@@ -66,12 +91,12 @@ class OrderFilter(FilterSet):
     Filter set for the Order model, including filters on related Customer and Product models.
     """
     # Total amount range
-    total_amount__gte = DecimalFilter(field_name='total_amount', lookup_expr='gte')
-    total_amount__lte = DecimalFilter(field_name='total_amount', lookup_expr='lte')
+    total_amount__gte = NumberFilter(field_name='total_amount', lookup_expr='gte')
+    total_amount__lte = NumberFilter(field_name='total_amount', lookup_expr='lte')
 
     # Order date range
-    order_date__gte = DateFilter(field_name='order_date', lookup_expr='date__gte')
-    order_date__lte = DateFilter(field_name='order_date', lookup_expr='date__lte')
+    order_date__gte = DateFilter(field_name='order_date', method=filter_on_or_after)
+    order_date__lte = DateFilter(field_name='order_date', method=filter_on_or_before)
 
     # Filter by related customer's name (case-insensitive partial match)
     customer_name = CharFilter(field_name='customer__name', lookup_expr='icontains', distinct=True)
@@ -11,6 +11,13 @@ class Customer(models.Model):
     phone = models.CharField(max_length=20, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Backs order_by('name', 'id') in resolve_all_customers and the created_at range filters
+        indexes = [
+            models.Index(fields=['name', 'id'], name='crm_customer_name_id_idx'),
+            models.Index(fields=['created_at'], name='crm_customer_created_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -22,6 +29,13 @@ class Product(models.Model):
     stock = models.IntegerField(default=0, help_text="Stock quantity, cannot be negative.")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Serve ordering/range lookups on name and created_at (icontains cannot use a b-tree index)
+        indexes = [
+            models.Index(fields=['name'], name='crm_product_name_idx'),
+            models.Index(fields=['created_at'], name='crm_product_created_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -37,5 +51,12 @@ class Order(models.Model):
     total_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
     order_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Backs the order_date and total_amount range filters
+        indexes = [
+            models.Index(fields=['order_date'], name='crm_order_date_idx'),
+            models.Index(fields=['total_amount'], name='crm_order_total_idx'),
+        ]
+
     def __str__(self):
         return f"Order {self.id.hex[:8]} for {self.customer.name}"
@@ -1,20 +1,28 @@
 import graphene
+from graphene.utils.str_converters import to_snake_case
 from graphene_django.types import DjangoObjectType
+from graphene_django.filter import DjangoFilterConnectionField
+from graphql_relay import from_global_id
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Sum
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+import binascii
 import re
-import json # Used to format structured error output
+import uuid
 
 from .models import Customer, Product, Order
+from .filters import CustomerFilter
 
 # --- 1. Graphene Types (Outputs) ---
 
 class CustomerType(DjangoObjectType):
     class Meta:
         model = Customer
-        fields = ('id', 'name', 'email', 'phone', 'created_at')
+        interfaces = (graphene.relay.Node,)
+        fields = ('id', 'name', 'email', 'phone', 'created_at', 'orders')
 
 class ProductType(DjangoObjectType):
     class Meta:
@@ -29,6 +37,16 @@ class OrderType(DjangoObjectType):
         model = Order
         fields = ('id', 'customer', 'products', 'total_amount', 'order_date')
 
+    def resolve_products(self, info):
+        # .all() reads from the prefetch cache when the parent queryset prefetched products
+        return self.products.all()
+
+class BulkCustomerError(graphene.ObjectType):
+    """A per-item failure reported by the bulk customer mutation."""
+    index = graphene.Int()
+    email = graphene.String()
+    error = graphene.String()
+
 
 # --- 2. Graphene Inputs (Used for Arguments in Mutations) ---
 
@@ -48,40 +66,172 @@ class OrderInput(graphene.InputObjectType):
     product_ids = graphene.List(graphene.ID, required=True)
 
 
-# --- 3. Validation Helpers ---
+# --- 3. Query Optimization Helpers ---
+
+def _collect_selections(selection_set, fragments):
+    """
+    Maps each selected field name (snake_case) to its sub-selection set,
+    flattening inline fragments and fragment spreads.
+    """
+    selected = {}
+    if selection_set is None:
+        return selected
+    for selection in selection_set.selections:
+        kind = selection.kind
+        if kind == 'field':
+            selected[to_snake_case(selection.name.value)] = selection.selection_set
+        elif kind == 'inline_fragment':
+            selected.update(_collect_selections(selection.selection_set, fragments))
+        elif kind == 'fragment_spread':
+            fragment = fragments.get(selection.name.value)
+            if fragment is not None:
+                selected.update(_collect_selections(fragment.selection_set, fragments))
+    return selected
+
+def _selection_sets(info, path=()):
+    """
+    Returns the selection sets found by following `path` (snake_case field names)
+    from the current field, e.g. ('edges', 'node') for a relay connection.
+    """
+    selection_sets = [field_node.selection_set for field_node in info.field_nodes]
+    for name in path:
+        selection_sets = [
+            _collect_selections(selection_set, info.fragments).get(name)
+            for selection_set in selection_sets
+        ]
+    return [selection_set for selection_set in selection_sets if selection_set is not None]
+
+def _selected_fields(info, path=()):
+    """Returns the snake_case names of the fields selected under the current field (or `path`)."""
+    selected = set()
+    for selection_set in _selection_sets(info, path):
+        selected.update(_collect_selections(selection_set, info.fragments))
+    return selected
+
+def _selected_relations(info, relations, path=()):
+    """
+    Walks the GraphQL selection set of the current field (or `path`) and returns the ORM
+    lookups (e.g. 'orders', 'orders__products') that the query actually asks for.
+    `relations` is a nested dict mirroring the types, e.g. {'orders': {'products': {}}}.
+    """
+    def walk(selection_set, relation_tree, prefix):
+        lookups = []
+        selected = _collect_selections(selection_set, info.fragments)
+        for name, children in relation_tree.items():
+            if name in selected:
+                lookup = f"{prefix}__{name}" if prefix else name
+                lookups.append(lookup)
+                lookups.extend(walk(selected[name], children, lookup))
+        return lookups
+
+    lookups = []
+    for selection_set in _selection_sets(info, path):
+        for lookup in walk(selection_set, relations, ''):
+            if lookup not in lookups:
+                lookups.append(lookup)
+    return lookups
+
+# Reverse-FK and M2M relations reachable from CustomerType, resolved via prefetch_related
+CUSTOMER_PREFETCH_RELATIONS = {'orders': {'products': {}}}
+# CustomerType fields backed by a concrete column on the customer table
+CUSTOMER_COLUMNS = ('id', 'name', 'email', 'phone', 'created_at')
+# Where the CustomerType selection lives inside a relay connection
+CONNECTION_NODE_PATH = ('edges', 'node')
+
+def optimized_customer_queryset(info, path=()):
+    """
+    Returns a Customer queryset that loads only the columns selected in the query and
+    prefetches only the selected relations, so nested `orders { products }` costs a
+    constant number of queries instead of N+1.
+    Pass `path=CONNECTION_NODE_PATH` when resolving a connection field.
+    """
+    # The orders prefetch caches this same (possibly deferred) instance as order.customer,
+    # so columns selected under `orders { customer }` must be loaded here too, or each one
+    # would trigger a refresh_from_db per customer.
+    selected = _selected_fields(info, path) | _selected_fields(info, path + ('orders', 'customer'))
+    # The primary key is always loaded: prefetches join on it and deferring it is not allowed
+    columns = ['id'] + [name for name in CUSTOMER_COLUMNS if name != 'id' and name in selected]
+    queryset = Customer.objects.only(*columns)
+
+    prefetches = _selected_relations(info, CUSTOMER_PREFETCH_RELATIONS, path)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    return queryset
+
+
+# --- 4. Validation Helpers ---
+
+# Digits, spaces, hyphens, and an optional leading +; compiled once at import time
+_PHONE_RE = re.compile(r'^\+?[\d\s-]{7,20}$')
 
 def validate_phone_format(phone):
     """
     Validates phone format (e.g., +1234567890 or 123-456-7890).
     """
     if phone:
-        # Simple regex allowing digits, spaces, hyphens, and leading +
-        if not re.match(r'^\+?[\d\s-]{7,20}$', str(phone)):
+        if not _PHONE_RE.match(str(phone)):
             raise ValidationError("Invalid phone format. Please use digits, hyphens, or include country code with '+'.")
 
-def validate_customer_data(data):
+def _as_uuid(value, label, node_type=None):
     """
-    Performs all customer-specific validations.
-    Returns None on success, or a detailed error message string on failure.
+    Parses an incoming ID into a UUID without touching the database.
+    When `node_type` is given (e.g. 'CustomerType'), a relay global ID of that type is
+    accepted as well; IDs of any other type are rejected.
+    Raises an Exception naming the offending value if it is malformed.
     """
-    if Customer.objects.filter(email=data.email).exists():
-        return f"Email '{data.email}' already exists."
-
     try:
-        validate_email(data.email)
+        return uuid.UUID(str(value))
+    except ValueError as error:
+        if node_type is None:
+            raise Exception(f"Invalid {label}: '{value}' is not a valid UUID.") from error
+    try:
+        type_name, raw_id = from_global_id(str(value))
+        if type_name != node_type:
+            raise ValueError(f"expected a {node_type} global ID, got type '{type_name}'")
+        return uuid.UUID(raw_id)
+    except (ValueError, binascii.Error) as error:
+        raise Exception(f"Invalid {label}: '{value}' is not a valid UUID or {node_type} ID.") from error
+
+@lru_cache(maxsize=4096)
+def _email_format_error(email):
+    """Memoized email format check; returns None on success or the error message."""
+    try:
+        validate_email(email)
     except ValidationError:
-        return f"Email '{data.email}' is not a valid email address."
+        return f"Email '{email}' is not a valid email address."
+    return None
 
+@lru_cache(maxsize=4096)
+def _phone_format_error(phone):
+    """Memoized phone format check; returns None on success or the error message."""
     try:
-        if data.phone:
-            validate_phone_format(data.phone)
+        validate_phone_format(phone)
     except ValidationError as e:
         # Convert error to string format
-        return f"Phone validation failed for '{data.phone}': {e.message}"
-
+        return f"Phone validation failed for '{phone}': {e.message}"
     return None
 
-# --- 4. Mutation Classes ---
+def validate_customer_format(data):
+    """
+    Performs the customer validations that do not need the database (email and phone format).
+    Returns None on success, or a detailed error message string on failure.
+    """
+    error_message = _email_format_error(data.email)
+    if error_message is None and data.phone:
+        error_message = _phone_format_error(data.phone)
+    return error_message
+
+def validate_customer_data(data):
+    """
+    Performs all customer-specific validations.
+    Returns None on success, or a detailed error message string on failure.
+    """
+    if Customer.objects.filter(email=data.email).exists():
+        return f"Email '{data.email}' already exists."
+
+    return validate_customer_format(data)
+
+# --- 5. Mutation Classes ---
 
 class CreateCustomer(graphene.Mutation):
     class Arguments:
@@ -112,44 +262,84 @@ class BulkCreateCustomers(graphene.Mutation):
 
     # Output fields
     customers = graphene.List(CustomerType)
-    # Errors are returned as a list of strings (JSON formatted for structure)
-    errors = graphene.List(graphene.String)
+    # Errors are returned as structured objects, one per failed input item
+    errors = graphene.List(BulkCustomerError)
 
     @staticmethod
     def mutate(root, info, input=None):
         created_customers = []
         errors = []
 
+        # Fetch every already-registered email of the batch in a single query
+        # instead of one .exists() round-trip per customer.
+        emails = [customer_data.email for customer_data in input]
+        claimed_emails = set(
+            Customer.objects.filter(email__in=emails).values_list('email', flat=True)
+        )
+
         # Challenge: Support partial success
+        pending = []  # (index, unsaved Customer) pairs that passed validation
         for i, customer_data in enumerate(input):
-            try:
-                # 1. Validation
-                error_message = validate_customer_data(customer_data)
-
-                if error_message:
-                    # Collect error and continue to next customer
-                    errors.append(json.dumps({
-                        'index': i,
-                        'email': customer_data.email,
-                        'error': error_message
-                    }))
-                    continue
-
-                # 2. Creation
-                customer = Customer.objects.create(
-                    name=customer_data.name,
+            # 1. Validation (duplicates in the batch itself count as already existing)
+            if customer_data.email in claimed_emails:
+                error_message = f"Email '{customer_data.email}' already exists."
+            else:
+                error_message = validate_customer_format(customer_data)
+
+            if error_message:
+                # Collect error and continue to next customer
+                errors.append(BulkCustomerError(
+                    index=i,
                     email=customer_data.email,
-                    phone=customer_data.phone
-                )
-                created_customers.append(customer)
-
+                    error=error_message
+                ))
+                continue
+
+            claimed_emails.add(customer_data.email)
+            pending.append((i, Customer(
+                name=customer_data.name,
+                email=customer_data.email,
+                phone=customer_data.phone
+            )))
+
+        # 2. Creation: a single batched INSERT for all valid customers
+        if pending:
+            try:
+                with transaction.atomic():
+                    created_customers = Customer.objects.bulk_create(
+                        [customer for _, customer in pending], batch_size=500
+                    )
+            except IntegrityError:
+                # An email was registered concurrently after the pre-check; insert row by row
+                # so only the colliding customers fail and the rest of the batch is kept.
+                created_customers = []
+                for i, customer in pending:
+                    try:
+                        with transaction.atomic():
+                            customer.save(force_insert=True)
+                        created_customers.append(customer)
+                    except IntegrityError:
+                        errors.append(BulkCustomerError(
+                            index=i,
+                            email=customer.email,
+                            error=f"Email '{customer.email}' already exists."
+                        ))
+                    except Exception as e:
+                        errors.append(BulkCustomerError(
+                            index=i,
+                            email=customer.email,
+                            error=f"Internal error: {str(e)}"
+                        ))
             except Exception as e:
                 # Catch any unexpected system errors (e.g., database connection failure)
-                errors.append(json.dumps({
-                    'index': i,
-                    'email': customer_data.email,
-                    'error': f"Internal error: {str(e)}"
-                }))
+                for i, customer in pending:
+                    errors.append(BulkCustomerError(
+                        index=i,
+                        email=customer.email,
+                        error=f"Internal error: {str(e)}"
+                    ))
+            # Creation errors are collected after validation errors; report them in input order
+            errors.sort(key=lambda error: error.index)
 
         return BulkCreateCustomers(customers=created_customers, errors=errors)
 
@@ -198,26 +388,36 @@ class CreateOrder(graphene.Mutation):
         if not product_ids:
             raise Exception("Order must include at least one product ID.")
 
+        # Malformed IDs are rejected here, before any query is issued
+        customer_uuid = _as_uuid(customer_id, 'customer ID', 'CustomerType')
+        # Parse and de-duplicate in one pass, keeping the order the client sent the IDs in
+        unique_product_ids = list(dict.fromkeys(_as_uuid(pid, 'product ID') for pid in product_ids))
+
         # Validation 2: Customer existence
         try:
-            customer = Customer.objects.get(id=customer_id)
-        except (Customer.DoesNotExist, ValidationError):
-             # ValidationError catches invalid UUID format
+            customer = Customer.objects.get(id=customer_uuid)
+        except Customer.DoesNotExist:
             raise Exception(f"Invalid customer ID: '{customer_id}' was not found.")
 
-        # Validation 3: Product existence and fetching
-        # Use a list of unique IDs to prevent duplicate products causing issues
-        unique_product_ids = list(set(product_ids))
-        products = Product.objects.filter(id__in=unique_product_ids)
+        # Validation 3: Product existence
+        # Existence check and total are computed together in a single aggregate query
+        product_totals = Product.objects.filter(id__in=unique_product_ids).aggregate(
+            count=Count('id'),
+            total=Sum('price')
+        )
 
-        if products.count() != len(unique_product_ids):
-            existing_ids = set(str(p.id) for p in products)
-            all_ids = set(unique_product_ids)
-            invalid_ids = list(all_ids - existing_ids)
-            raise Exception(f"One or more product IDs are invalid: {', '.join(invalid_ids)}")
+        if product_totals['count'] != len(unique_product_ids):
+            # Compare UUIDs directly; only the missing ones are stringified for the message
+            existing_ids = set(
+                Product.objects.filter(id__in=unique_product_ids).values_list('id', flat=True)
+            )
+            invalid_ids = [pid for pid in unique_product_ids if pid not in existing_ids]
+            raise Exception(f"One or more product IDs are invalid: {', '.join(map(str, invalid_ids))}")
 
-        # 4. Calculate total amount
-        total_amount = sum(p.price for p in products)
+        # 4. Total amount comes straight from the SQL SUM. SQLite sums decimals as floats and
+        # returns them unquantized, so round to the column's scale to match what is stored.
+        decimal_places = Order._meta.get_field('total_amount').decimal_places
+        total_amount = product_totals['total'].quantize(Decimal(1).scaleb(-decimal_places))
 
         # 5. Create the Order object
         order = Order.objects.create(
@@ -225,13 +425,17 @@ class CreateOrder(graphene.Mutation):
             total_amount=total_amount
         )
 
-        # 6. Associate products
-        order.products.set(products)
+        # 6. Associate products with one INSERT on the through table
+        # (the order is brand new, so .set()'s SELECT of current members is unnecessary)
+        OrderProduct = Order.products.through
+        OrderProduct.objects.bulk_create(
+            [OrderProduct(order_id=order.id, product_id=pid) for pid in unique_product_ids]
+        )
 
         return CreateOrder(order=order)
 
 
-# --- 5. CRM App Root Query and Mutation ---
+# --- 6. CRM App Root Query and Mutation ---
 
 class CRMQuery(graphene.ObjectType):
     """
@@ -239,17 +443,23 @@ class CRMQuery(graphene.ObjectType):
     We add a simple query to retrieve customers for testing the mutation output.
     """
     customer = graphene.Field(CustomerType, id=graphene.ID())
-    all_customers = graphene.List(CustomerType)
+    # Relay connection: clients page with first/after, and a page is capped at max_limit rows
+    all_customers = DjangoFilterConnectionField(
+        CustomerType,
+        filterset_class=CustomerFilter,
+        max_limit=100
+    )
 
     def resolve_customer(root, info, id):
         try:
-            return Customer.objects.get(id=id)
+            return optimized_customer_queryset(info).get(id=_as_uuid(id, 'customer ID', 'CustomerType'))
         except Customer.DoesNotExist:
             return None
 
-    def resolve_all_customers(root, info):
-        # Sort for predictable results
-        return Customer.objects.all().order_by('name')
+    def resolve_all_customers(root, info, **kwargs):
+        # Sort for predictable results; the connection applies filters and LIMIT/OFFSET on top,
+        # so ties on the non-unique name are broken by id to keep pages stable
+        return optimized_customer_queryset(info, CONNECTION_NODE_PATH).order_by('name', 'id')
 
 class CRMMutation(graphene.ObjectType):
     """
@@ -1,3 +1,422 @@
+from datetime import date, datetime
+from decimal import Decimal
+import uuid
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from graphql_relay import to_global_id
+
+from alx_backend_graphql_crm.schema import schema
+from .filters import CustomerFilter, OrderFilter
+from .models import Customer, Product, Order
+
+
+class AllCustomersPrefetchTests(TestCase):
+    """all_customers should cost a constant number of queries, whatever the nesting."""
+
+    @classmethod
+    def setUpTestData(cls):
+        products = [
+            Product.objects.create(name=f"Product {i}", price=Decimal('10.00'), stock=5)
+            for i in range(3)
+        ]
+        for i in range(4):
+            customer = Customer.objects.create(name=f"Customer {i}", email=f"customer{i}@example.com")
+            for _ in range(2):
+                order = Order.objects.create(customer=customer, total_amount=Decimal('30.00'))
+                order.products.set(products)
+
+    def test_nested_orders_and_products_are_prefetched(self):
+        query = """
+            query {
+                allCustomers(first: 10) {
+                    edges { node { name orders { totalAmount products { name } } } }
+                }
+            }
+        """
+        # connection count + customers + orders + products
+        with self.assertNumQueries(4):
+            result = schema.execute(query)
+
+        self.assertIsNone(result.errors)
+        edges = result.data['allCustomers']['edges']
+        self.assertEqual(len(edges), 4)
+        for edge in edges:
+            self.assertEqual(len(edge['node']['orders']), 2)
+            for order in edge['node']['orders']:
+                self.assertEqual(len(order['products']), 3)
+
+    def test_relations_are_not_prefetched_unless_selected(self):
+        with self.assertNumQueries(2):
+            result = schema.execute("query { allCustomers(first: 10) { edges { node { name } } } }")
+
+        self.assertIsNone(result.errors)
+        self.assertEqual(len(result.data['allCustomers']['edges']), 4)
+
+    def test_customer_under_orders_does_not_refetch_deferred_columns(self):
+        query = """
+            query {
+                allCustomers(first: 10) {
+                    edges { node { name orders { customer { name email } } } }
+                }
+            }
+        """
+        # The prefetch reuses the outer customer, so email must not be deferred on it
+        with self.assertNumQueries(3):
+            result = schema.execute(query)
+
+        self.assertIsNone(result.errors)
+        for edge in result.data['allCustomers']['edges']:
+            for order in edge['node']['orders']:
+                self.assertEqual(order['customer']['name'], edge['node']['name'])
+                self.assertTrue(order['customer']['email'].endswith('@example.com'))
+
+
+BULK_CREATE_CUSTOMERS = """
+    mutation($input: [CustomerInput]!) {
+        bulkCreateCustomers(input: $input) {
+            customers { name email }
+            errors { index email error }
+        }
+    }
+"""
+
+
+class BulkCreateCustomersTests(TestCase):
+
+    def setUp(self):
+        Customer.objects.create(name="Existing", email="existing@example.com")
+
+    def test_partial_success_reports_errors_per_index(self):
+        batch = [
+            {'name': "Alice", 'email': "alice@example.com", 'phone': "+1234567890"},
+            {'name': "Existing again", 'email': "existing@example.com"},
+            {'name': "Alice twin", 'email': "alice@example.com"},
+            {'name': "Bad email", 'email': "not-an-email"},
+            {'name': "Bad phone", 'email': "bob@example.com", 'phone': "abc"},
+            {'name': "Carol", 'email': "carol@example.com"},
+        ]
+        # existing-email lookup + savepoint, batched INSERT, release
+        with self.assertNumQueries(4):
+            result = schema.execute(BULK_CREATE_CUSTOMERS, variables={'input': batch})
+
+        self.assertIsNone(result.errors)
+        payload = result.data['bulkCreateCustomers']
+        self.assertEqual(
+            [customer['email'] for customer in payload['customers']],
+            ["alice@example.com", "carol@example.com"]
+        )
+        self.assertEqual([error['index'] for error in payload['errors']], [1, 2, 3, 4])
+        self.assertEqual(payload['errors'][0]['error'], "Email 'existing@example.com' already exists.")
+        self.assertEqual(payload['errors'][1]['error'], "Email 'alice@example.com' already exists.")
+        self.assertIn("not a valid email", payload['errors'][2]['error'])
+        self.assertIn("Phone validation failed", payload['errors'][3]['error'])
+        self.assertEqual(Customer.objects.count(), 3)
+
+    def test_concurrent_duplicate_only_fails_the_colliding_row(self):
+        batch = [
+            {'name': "Dave", 'email': "dave@example.com"},
+            {'name': "Raced", 'email': "existing@example.com"},
+            {'name': "Erin", 'email': "erin@example.com"},
+        ]
+        # Simulate another request inserting the email after the pre-check ran:
+        # only the existing-email lookup (email__in) is blinded, every other query is real
+        real_filter = Customer.objects.filter
+
+        def filter_before_race(*args, **kwargs):
+            if 'email__in' in kwargs:
+                return Customer.objects.none()
+            return real_filter(*args, **kwargs)
+
+        with mock.patch.object(Customer.objects, 'filter', side_effect=filter_before_race) as patched:
+            result = schema.execute(BULK_CREATE_CUSTOMERS, variables={'input': batch})
+        self.assertTrue(any('email__in' in call.kwargs for call in patched.call_args_list))
+
+        self.assertIsNone(result.errors)
+        payload = result.data['bulkCreateCustomers']
+        self.assertEqual(
+            [customer['email'] for customer in payload['customers']],
+            ["dave@example.com", "erin@example.com"]
+        )
+        self.assertEqual(payload['errors'], [{
+            'index': 1,
+            'email': "existing@example.com",
+            'error': "Email 'existing@example.com' already exists."
+        }])
+        self.assertTrue(Customer.objects.filter(email="erin@example.com").exists())
+
+
+class DateRangeFilterTests(TestCase):
+    """Date bounds are whole days in the current timezone, both ends inclusive."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tz = tz = timezone.get_fixed_timezone(-5 * 60)
+        cls.late = Customer.objects.create(name="Late", email="late@example.com")
+        cls.next_day = Customer.objects.create(name="Next day", email="next@example.com")
+        Customer.objects.filter(pk=cls.late.pk).update(
+            created_at=datetime(2026, 3, 10, 23, 30, tzinfo=tz)
+        )
+        Customer.objects.filter(pk=cls.next_day.pk).update(
+            created_at=datetime(2026, 3, 11, 0, 0, tzinfo=tz)
+        )
+        cls.late_order = Order.objects.create(customer=cls.late)
+        cls.next_day_order = Order.objects.create(customer=cls.next_day)
+        Order.objects.filter(pk=cls.late_order.pk).update(
+            order_date=datetime(2026, 3, 10, 23, 59, 59, tzinfo=tz)
+        )
+        Order.objects.filter(pk=cls.next_day_order.pk).update(
+            order_date=datetime(2026, 3, 11, 0, 0, tzinfo=tz)
+        )
+
+    def filtered_names(self, data):
+        with timezone.override(self.tz):
+            return set(CustomerFilter(data, queryset=Customer.objects.all()).qs.values_list('name', flat=True))
+
+    def filtered_orders(self, data):
+        with timezone.override(self.tz):
+            return set(OrderFilter(data, queryset=Order.objects.all()).qs)
+
+    def test_created_at_lte_includes_the_whole_day(self):
+        self.assertEqual(self.filtered_names({'created_at__lte': '2026-03-10'}), {"Late"})
+
+    def test_created_at_gte_starts_at_local_midnight(self):
+        self.assertEqual(self.filtered_names({'created_at__gte': '2026-03-11'}), {"Next day"})
+
+    def test_created_at_single_day_range(self):
+        data = {'created_at__gte': '2026-03-10', 'created_at__lte': '2026-03-10'}
+        self.assertEqual(self.filtered_names(data), {"Late"})
+
+    def test_order_date_bounds_are_inclusive(self):
+        self.assertEqual(self.filtered_orders({'order_date__lte': '2026-03-10'}), {self.late_order})
+        self.assertEqual(self.filtered_orders({'order_date__gte': '2026-03-11'}), {self.next_day_order})
+
+    def test_created_at_lte_argument_on_all_customers(self):
+        query = """
+            query($day: Date) {
+                allCustomers(first: 10, createdAt_Lte: $day) { edges { node { name } } }
+            }
+        """
+        with timezone.override(self.tz):
+            result = schema.execute(query, variables={'day': date(2026, 3, 10).isoformat()})
+
+        self.assertIsNone(result.errors)
+        self.assertEqual([edge['node']['name'] for edge in result.data['allCustomers']['edges']], ["Late"])
+
+
+class AllCustomersPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Customer.objects.bulk_create([
+            Customer(name=f"Customer {i:03}", email=f"customer{i}@example.com") for i in range(101)
+        ])
+
+    def test_page_size_defaults_to_max_limit(self):
+        result = schema.execute("""
+            query { allCustomers { pageInfo { hasNextPage } edges { node { name } } } }
+        """)
+
+        self.assertIsNone(result.errors)
+        self.assertEqual(len(result.data['allCustomers']['edges']), 100)
+        self.assertTrue(result.data['allCustomers']['pageInfo']['hasNextPage'])
+
+    def test_first_above_max_limit_is_rejected(self):
+        result = schema.execute("query { allCustomers(first: 101) { edges { node { name } } } }")
+
+        self.assertIsNotNone(result.errors)
+        self.assertIn("exceeds the `first` limit of 100", result.errors[0].message)
+
+    def test_pages_follow_the_cursor(self):
+        query = """
+            query($after: String) {
+                allCustomers(first: 60, after: $after) {
+                    pageInfo { hasNextPage endCursor }
+                    edges { node { name } }
+                }
+            }
+        """
+        first_page = schema.execute(query).data['allCustomers']
+        second_page = schema.execute(
+            query, variables={'after': first_page['pageInfo']['endCursor']}
+        ).data['allCustomers']
+
+        self.assertEqual(first_page['edges'][0]['node']['name'], "Customer 000")
+        self.assertEqual(second_page['edges'][0]['node']['name'], "Customer 060")
+        self.assertEqual(len(second_page['edges']), 41)
+        self.assertFalse(second_page['pageInfo']['hasNextPage'])
+
+
+class AllCustomersTiedNamePaginationTests(TestCase):
+    """Customers sharing a name must each appear exactly once across cursor pages."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Customer.objects.bulk_create([
+            Customer(name="Same name", email=f"same{i}@example.com") for i in range(25)
+        ] + [
+            Customer(name="Another", email=f"another{i}@example.com") for i in range(5)
+        ])
+
+    def test_pages_do_not_skip_or_repeat_customers_with_equal_names(self):
+        query = """
+            query($after: String) {
+                allCustomers(first: 7, after: $after) {
+                    pageInfo { hasNextPage endCursor }
+                    edges { node { id } }
+                }
+            }
+        """
+        seen, after = [], None
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                page = schema.execute(query, variables={'after': after}).data['allCustomers']
+            # Ties must be broken explicitly, not left to the backend's row order
+            self.assertIn(
+                'ORDER BY "crm_customer"."name" ASC, "crm_customer"."id" ASC',
+                queries.captured_queries[-1]['sql']
+            )
+            seen.extend(edge['node']['id'] for edge in page['edges'])
+            if not page['pageInfo']['hasNextPage']:
+                break
+            after = page['pageInfo']['endCursor']
+
+        expected = [
+            to_global_id('CustomerType', pk)
+            for pk in Customer.objects.order_by('name', 'id').values_list('id', flat=True)
+        ]
+        self.assertEqual(seen, expected)
+
+
+class GlobalIdTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(name="Alice", email="alice@example.com")
+        cls.product = Product.objects.create(name="Laptop", price=Decimal('999.99'), stock=3)
+
+    def create_order(self, customer_id, product_ids):
+        return schema.execute("""
+            mutation($input: OrderInput!) {
+                createOrder(input: $input) { order { totalAmount customer { name } } }
+            }
+        """, variables={'input': {'customerId': customer_id, 'productIds': product_ids}})
+
+    def test_customer_query_accepts_global_and_raw_ids(self):
+        query = "query($id: ID) { customer(id: $id) { id name } }"
+        for customer_id in (to_global_id('CustomerType', self.customer.pk), str(self.customer.pk)):
+            result = schema.execute(query, variables={'id': customer_id})
+            self.assertIsNone(result.errors)
+            self.assertEqual(result.data['customer']['name'], "Alice")
+            self.assertEqual(result.data['customer']['id'], to_global_id('CustomerType', self.customer.pk))
+
+    def test_create_order_accepts_customer_global_id(self):
+        result = self.create_order(to_global_id('CustomerType', self.customer.pk), [str(self.product.pk)])
+
+        self.assertIsNone(result.errors)
+        order = result.data['createOrder']['order']
+        self.assertEqual(order['customer']['name'], "Alice")
+        self.assertEqual(order['totalAmount'], "999.99")
+
+    def test_global_id_of_another_type_is_rejected(self):
+        result = self.create_order(to_global_id('ProductType', self.customer.pk), [str(self.product.pk)])
+
+        self.assertIsNotNone(result.errors)
+        self.assertIn("Invalid customer ID", result.errors[0].message)
+        self.assertFalse(Order.objects.exists())
+
+    def test_product_ids_must_be_raw_uuids(self):
+        result = self.create_order(str(self.customer.pk), [to_global_id('CustomerType', self.product.pk)])
+
+        self.assertIsNotNone(result.errors)
+        self.assertIn("Invalid product ID", result.errors[0].message)
+        self.assertFalse(Order.objects.exists())
+
+
+CREATE_ORDER = """
+    mutation($input: OrderInput!) {
+        createOrder(input: $input) { order { totalAmount products { name } } }
+    }
+"""
+
+
+class CreateOrderTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(name="Alice", email="alice@example.com")
+        cls.products = [
+            Product.objects.create(name=f"Item {i}", price=price, stock=10)
+            for i, price in enumerate([Decimal('0.10'), Decimal('0.20'), Decimal('19.99'), Decimal('0.07')])
+        ]
+
+    def create_order(self, product_ids):
+        return schema.execute(CREATE_ORDER, variables={
+            'input': {'customerId': str(self.customer.pk), 'productIds': product_ids}
+        })
+
+    def test_total_amount_is_rounded_to_the_column_scale(self):
+        result = self.create_order([str(product.pk) for product in self.products])
+
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data['createOrder']['order']['totalAmount'], "20.36")
+        self.assertEqual(Order.objects.get().total_amount, Decimal('20.36'))
+
+    def test_total_amount_keeps_two_decimal_places(self):
+        result = self.create_order([str(self.products[0].pk), str(self.products[1].pk)])
+
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data['createOrder']['order']['totalAmount'], "0.30")
+
+    def test_malformed_ids_are_rejected_without_querying_tables(self):
+        # Only the savepoint bookkeeping of @transaction.atomic reaches the database
+        with self.assertNumQueries(3):
+            result = self.create_order([str(self.products[0].pk), "not-a-uuid"])
+
+        self.assertIsNotNone(result.errors)
+        self.assertEqual(result.errors[0].message, "Invalid product ID: 'not-a-uuid' is not a valid UUID.")
+
+        with self.assertNumQueries(3):
+            result = schema.execute(CREATE_ORDER, variables={
+                'input': {'customerId': "12345", 'productIds': [str(self.products[0].pk)]}
+            })
+
+        self.assertIsNotNone(result.errors)
+        self.assertIn("Invalid customer ID: '12345'", result.errors[0].message)
+        self.assertFalse(Order.objects.exists())
+
+    def test_unknown_product_id_is_reported(self):
+        unknown_id = str(uuid.uuid4())
+        result = self.create_order([str(self.products[0].pk), unknown_id])
+
+        self.assertIsNotNone(result.errors)
+        self.assertEqual(
+            result.errors[0].message,
+            f"One or more product IDs are invalid: {unknown_id}"
+        )
+        self.assertFalse(Order.objects.exists())
+
+    def test_duplicate_product_ids_are_counted_once(self):
+        product = self.products[2]
+        result = self.create_order([str(product.pk), str(product.pk).upper()])
+
+        self.assertIsNone(result.errors)
+        self.assertEqual(result.data['createOrder']['order']['totalAmount'], "19.99")
+        self.assertEqual(Order.products.through.objects.filter(product=product).count(), 1)
+        self.assertEqual(Order.objects.get().total_amount, Decimal('19.99'))
+
+    def test_invalid_product_ids_are_reported_in_request_order(self):
+        unknown_ids = [uuid.UUID(int=3), uuid.UUID(int=1), uuid.UUID(int=2)]
+        result = self.create_order(
+            [str(unknown_ids[0]), str(self.products[0].pk), str(unknown_ids[1]),
+             str(unknown_ids[0]).upper(), str(unknown_ids[2])]
+        )
 
-# Create your tests here.
+        self.assertIsNotNone(result.errors)
+        self.assertEqual(
+            result.errors[0].message,
+            f"One or more product IDs are invalid: {', '.join(map(str, unknown_ids))}"
+        )